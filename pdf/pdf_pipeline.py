@@ -0,0 +1,215 @@
+"""PDF 操作流水线：在内存中依次执行剪切/旋转/删除/插入/合并/压缩，最后只写出一次文件"""
+import sys
+import os
+import json
+from io import BytesIO
+
+from PyPDF2 import PdfReader, PdfWriter
+
+# 压缩等级参数，主界面“压缩 PDF”也使用这份表
+COMPRESS_LEVELS = {
+    "高质量 (大文件)": {"garbage": 1, "deflate": False, "clean": True},
+    "中等质量": {"garbage": 3, "deflate": True, "clean": True},
+    "小文件 (低质量)": {"garbage": 4, "deflate": True, "clean": True},
+}
+COMPRESS_ALIASES = {
+    "high": "高质量 (大文件)",
+    "medium": "中等质量",
+    "low": "小文件 (低质量)",
+}
+
+
+class PipelineError(Exception):
+    """流水线配置或执行错误"""
+
+
+class PdfPipeline:
+    """在内存页面列表上链式执行操作，save() 时一次性序列化"""
+
+    # 配置中允许的操作，对应同名方法
+    STEP_OPS = ("cut", "rotate", "delete", "insert", "merge", "compress")
+
+    def __init__(self, pages=None):
+        self.pages = list(pages) if pages else []
+        self.compress_level = None
+
+    # ---------------- 读取 ----------------
+    @staticmethod
+    def _read_pages(path):
+        # 每次都重新解析，保证同一文件多次加入时页面对象互不共享
+        return list(PdfReader(path).pages)
+
+    def _check_page(self, number):
+        if not 1 <= number <= len(self.pages):
+            raise PipelineError(f"页码超出范围: {number} (共 {len(self.pages)} 页)")
+        return number - 1
+
+    @classmethod
+    def open(cls, path):
+        return cls(cls._read_pages(path))
+
+    # ---------------- 操作 ----------------
+    def cut(self, start, end):
+        """保留第 start 到 end 页（从 1 开始，包含两端，两端都必须在文档内）"""
+        if end < start:
+            raise PipelineError(f"无效页码范围: {start}-{end}")
+        self._check_page(start)
+        self._check_page(end)
+        self.pages = self.pages[start - 1:end]
+        return self
+
+    def rotate(self, angle, pages=None):
+        """旋转指定页（pages 为 None 时旋转全部页，空列表不旋转）"""
+        if angle % 90 != 0:
+            raise PipelineError(f"旋转角度必须是 90 的倍数: {angle}")
+        indexes = {self._check_page(n) for n in pages} if pages is not None else range(len(self.pages))
+        for i in indexes:
+            self.pages[i].rotate(angle)
+        return self
+
+    def delete(self, pages):
+        """删除指定页（页码基于当前文档）"""
+        indexes = {self._check_page(n) for n in pages}
+        self.pages = [page for i, page in enumerate(self.pages) if i not in indexes]
+        return self
+
+    def insert(self, file, after=None):
+        """在第 after 页之后插入 file 的全部页（默认插到末尾，0 表示开头）"""
+        if after is None:
+            after = len(self.pages)
+        elif after != 0:
+            self._check_page(after)
+        self.pages[after:after] = self._read_pages(file)
+        return self
+
+    def merge(self, files):
+        """依次把 files 的全部页追加到末尾"""
+        for file in files:
+            self.pages.extend(self._read_pages(file))
+        return self
+
+    def compress(self, level="中等质量"):
+        """设置压缩等级，在 save() 时生效"""
+        level = COMPRESS_ALIASES.get(level, level)
+        if level not in COMPRESS_LEVELS:
+            raise PipelineError(f"未知压缩等级: {level}")
+        self.compress_level = level
+        return self
+
+    # ---------------- 输出 ----------------
+    def save(self, output_path):
+        if not self.pages:
+            raise PipelineError("没有可保存的 PDF 页面")
+        writer = PdfWriter()
+        for page in self.pages:
+            writer.add_page(page)
+
+        if self.compress_level is None:
+            with open(output_path, "wb") as f:
+                writer.write(f)
+            return output_path
+
+        # 压缩时直接从内存缓冲交给 PyMuPDF，不落盘中间文件
+        import fitz  # PyMuPDF
+        buffer = BytesIO()
+        writer.write(buffer)
+        doc = fitz.open(stream=buffer.getvalue(), filetype="pdf")
+        try:
+            doc.save(output_path, **COMPRESS_LEVELS[self.compress_level])
+        finally:
+            doc.close()
+        return output_path
+
+    # ---------------- 配置 ----------------
+    def apply(self, steps):
+        """按配置列表执行操作，如 [{"op": "cut", "start": 1, "end": 10}]"""
+        for step in steps:
+            if not isinstance(step, dict):
+                raise PipelineError(f"操作必须是 JSON 对象: {step!r}")
+            params = dict(step)
+            op = params.pop("op", None)
+            if op not in self.STEP_OPS:
+                raise PipelineError(f"未知操作: {op}")
+            try:
+                getattr(self, op)(**params)
+            except TypeError as e:
+                raise PipelineError(f"操作 {op} 参数错误: {e}")
+        return self
+
+
+def load_config(config_path):
+    """读取 JSON 配置，input/file/files 的相对路径以配置文件所在目录为准"""
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise PipelineError("配置顶层必须是 JSON 对象")
+    if not isinstance(config.get("steps"), list):
+        raise PipelineError("配置缺少 steps 列表")
+
+    base_dir = os.path.dirname(os.path.abspath(config_path))
+
+    def resolve(path):
+        if not isinstance(path, str):
+            raise PipelineError(f"文件路径必须是字符串: {path!r}")
+        return os.path.join(base_dir, path)
+
+    for step in config["steps"]:
+        if not isinstance(step, dict):
+            raise PipelineError(f"操作必须是 JSON 对象: {step!r}")
+        if "file" in step:
+            step["file"] = resolve(step["file"])
+        if "files" in step:
+            if not isinstance(step["files"], list):
+                raise PipelineError(f"files 必须是列表: {step['files']!r}")
+            step["files"] = [resolve(p) for p in step["files"]]
+    if "input" in config:
+        config["input"] = resolve(config["input"])
+    return config
+
+
+def output_path_for(config, input_path):
+    """输出路径：配置中的 output 支持 {name} 占位符，默认为 原名_processed.pdf
+
+    output 的相对路径以输入 PDF 所在目录为准，便于批处理时输出到各自旁边。
+    """
+    name = os.path.splitext(os.path.basename(input_path))[0]
+    pattern = config.get("output", "{name}_processed.pdf")
+    try:
+        output = pattern.format(name=name)
+    except (KeyError, IndexError, ValueError) as e:
+        raise PipelineError(f"output 格式错误: {pattern} ({e!r})")
+    return os.path.join(os.path.dirname(input_path), output)
+
+
+def run_config(config, input_path=None, output_path=None):
+    """对单个输入文件执行配置中的流水线，返回输出路径"""
+    input_path = input_path or config.get("input")
+    if not input_path:
+        raise PipelineError("未指定输入 PDF")
+    output_path = output_path or output_path_for(config, input_path)
+    return PdfPipeline.open(input_path).apply(config["steps"]).save(output_path)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("用法: python pdf_pipeline.py 配置.json [输入1.pdf 输入2.pdf ...]")
+        return 2
+    try:
+        config = load_config(argv[0])
+    except (OSError, ValueError, PipelineError) as e:
+        print(f"配置读取失败: {e}")
+        return 2
+    inputs = argv[1:] or [None]
+    failed = 0
+    for input_path in inputs:
+        try:
+            print(f"完成: {run_config(config, input_path)}")
+        except Exception as e:
+            failed += 1
+            print(f"失败: {input_path or config.get('input')}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,6 +28,7 @@ def main():
     from PyQt5.QtCore import Qt, QSize
     from PyPDF2 import PdfReader, PdfWriter
     import fitz  # PyMuPDF
+    from pdf_pipeline import COMPRESS_LEVELS, load_config, run_config
 
     # ------------------ 压缩图标（Unicode 📦） ------------------
     def get_compress_icon():
@@ -153,7 +154,8 @@ def main():
                 ("合并 PDF", self.style().standardIcon(QStyle.SP_DirOpenIcon), self.merge_pdf),
                 ("拆分 PDF", self.style().standardIcon(QStyle.SP_FileDialogDetailedView), self.split_pdf),
                 ("旋转 PDF", self.style().standardIcon(QStyle.SP_BrowserReload), self.rotate_pdf),
-                ("压缩 PDF", get_compress_icon(), self.compress_pdf)
+                ("压缩 PDF", get_compress_icon(), self.compress_pdf),
+                ("批处理 PDF", self.style().standardIcon(QStyle.SP_FileDialogListView), self.pipeline_pdf)
             ]
             for text, icon, slot in left_buttons_info:
                 btn = QPushButton(text)
@@ -329,31 +331,8 @@ def main():
                         doc = fitz.open(self.input_path)
                         total_pages = len(doc)
 
-                        # 根据压缩等级设置参数
-                        if self.quality_level == "高质量 (大文件)":
-                            # 高质量：使用最少的压缩，保持高质量
-                            compress_params = {
-                                "garbage": 1,  # 最小程度的垃圾回收
-                                "deflate": False,  # 不使用压缩
-                                "clean": True,
-                                "linear": False  # 移除linear参数
-                            }
-                        elif self.quality_level == "中等质量":
-                            # 中等质量：平衡压缩和质量
-                            compress_params = {
-                                "garbage": 3,  # 中等垃圾回收
-                                "deflate": True,  # 使用压缩
-                                "clean": True,
-                                "linear": False  # 移除linear参数
-                            }
-                        else:  # 小文件 (低质量)
-                            # 低质量：最大压缩
-                            compress_params = {
-                                "garbage": 4,  # 最大垃圾回收
-                                "deflate": True,  # 使用压缩
-                                "clean": True,
-                                "linear": False  # 移除linear参数
-                            }
+                        # 根据压缩等级设置参数（与批处理共用同一份表）
+                        compress_params = COMPRESS_LEVELS[self.quality_level]
 
                         # 计算实际压缩步骤
                         total_steps = 50  # 总共50步，更精细的控制
@@ -367,10 +346,7 @@ def main():
                         self.progress.emit(20)
 
                         # 保存PDF，移除linear和ascii参数
-                        doc.save(self.output_path,
-                                 garbage=compress_params["garbage"],
-                                 deflate=compress_params["deflate"],
-                                 clean=compress_params["clean"])
+                        doc.save(self.output_path, **compress_params)
 
                         # 步骤3: 完成压缩
                         for i in range(20, 101):
@@ -489,6 +465,96 @@ def main():
             # 启动线程
             compress_thread.start()
 
+        def pipeline_pdf(self):
+            from PyQt5.QtCore import QThread, pyqtSignal
+            from PyQt5.QtWidgets import QProgressDialog
+
+            class PipelineThread(QThread):
+                progress = pyqtSignal(int, str)  # 参数: 已处理文件数, 当前文件名
+                finished = pyqtSignal(list, list)  # 参数: 成功输出路径, 失败信息
+
+                def __init__(self, config, files):
+                    super().__init__()
+                    self.config = config
+                    self.files = files
+
+                def run(self):
+                    done, failed = [], []
+                    for i, file in enumerate(self.files):
+                        # 只在文件之间响应取消，避免写出半个文件
+                        if self.isInterruptionRequested():
+                            break
+                        self.progress.emit(i, os.path.basename(file))
+                        try:
+                            done.append(run_config(self.config, file))
+                        except Exception as e:
+                            failed.append(f"{os.path.basename(file)}: {e}")
+                    # 被取消时不再刷新进度，避免已隐藏的对话框重新弹出
+                    if not self.isInterruptionRequested():
+                        self.progress.emit(len(done) + len(failed), "")
+                    self.finished.emit(done, failed)
+
+            config_file, _ = QFileDialog.getOpenFileName(self, "选择流水线配置", "", "JSON Files (*.json)")
+            if not config_file: return
+            try:
+                config = load_config(config_file)
+            except Exception as e:
+                QMessageBox.critical(self, "错误", f"配置读取失败:\n{e}")
+                return
+            files, _ = QFileDialog.getOpenFileNames(self, "选择要处理的 PDF 文件", "", "PDF Files (*.pdf)")
+            if not files: return
+
+            # 创建进度对话框，按文件计数
+            progress_dialog = QProgressDialog("正在批处理PDF...", "取消", 0, len(files), self)
+            progress_dialog.setWindowTitle("PDF批处理")
+            progress_dialog.setWindowModality(Qt.WindowModal)
+            progress_dialog.setMinimumDuration(0)
+            progress_dialog.setAutoClose(False)
+            progress_dialog.setAutoReset(False)
+            progress_dialog.setMinimumWidth(300)
+
+            pipeline_thread = PipelineThread(config, files)
+
+            current = {"value": 0}
+
+            def update_progress(value, name):
+                # 取消后忽略已排队的进度信号，保留“正在取消”提示
+                if pipeline_thread.isInterruptionRequested():
+                    return
+                current["value"] = value
+                progress_dialog.setValue(value)
+                if name:
+                    progress_dialog.setLabelText(f"正在处理 ({value + 1}/{len(files)}): {name}")
+
+            def on_finished(done, failed):
+                progress_dialog.close()
+                skipped = len(files) - len(done) - len(failed)
+                msg = f"成功 {len(done)} 个，失败 {len(failed)} 个"
+                if skipped:
+                    msg += f"，已取消 {skipped} 个"
+                if failed:
+                    QMessageBox.warning(self, "完成", msg + "\n\n" + "\n".join(failed))
+                else:
+                    QMessageBox.information(self, "完成", msg + "\n\n" + "\n".join(done))
+
+            pipeline_thread.progress.connect(update_progress)
+            pipeline_thread.finished.connect(on_finished)
+
+            # 取消按钮：当前文件处理完后停止
+            def cancel_pipeline():
+                pipeline_thread.requestInterruption()
+                # QProgressDialog 取消时会自动隐藏，这里重新显示，直到线程结束再由 on_finished 关闭
+                progress_dialog.setCancelButton(None)
+                progress_dialog.setLabelText("正在取消，等待当前文件完成...")
+                progress_dialog.setValue(current["value"])
+                progress_dialog.show()
+
+            progress_dialog.canceled.connect(cancel_pipeline)
+
+            # 保存引用，防止线程对象在运行中被回收
+            self.pipeline_thread = pipeline_thread
+            pipeline_thread.start()
+
         # ---------------- 页面操作函数 ----------------
         def open_pdf_edit(self):
             file, _ = QFileDialog.getOpenFileName(self, "选择 PDF 编辑", "", "PDF Files (*.pdf)")
@@ -0,0 +1,219 @@
+import os
+import sys
+import json
+
+import pytest
+
+pytest.importorskip("PyPDF2")
+from PyPDF2 import PdfReader, PdfWriter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "pdf"))
+from pdf_pipeline import PdfPipeline, PipelineError, load_config, main, output_path_for, run_config
+
+
+def make_pdf(path, widths):
+    """生成空白 PDF，用页宽区分每一页"""
+    writer = PdfWriter()
+    for width in widths:
+        writer.add_blank_page(width=width, height=100)
+    with open(path, "wb") as f:
+        writer.write(f)
+    return str(path)
+
+
+def widths(pipeline_or_path):
+    if isinstance(pipeline_or_path, PdfPipeline):
+        pages = pipeline_or_path.pages
+    else:
+        pages = PdfReader(pipeline_or_path).pages
+    return [int(page.mediabox.width) for page in pages]
+
+
+def rotations(path):
+    return [page.get("/Rotate", 0) for page in PdfReader(path).pages]
+
+
+@pytest.fixture
+def src(tmp_path):
+    return make_pdf(tmp_path / "src.pdf", [101, 102, 103, 104, 105])
+
+
+@pytest.fixture
+def cover(tmp_path):
+    return make_pdf(tmp_path / "cover.pdf", [201])
+
+
+# ---------------- 页面操作 ----------------
+def test_cut_keeps_inclusive_range(src):
+    assert widths(PdfPipeline.open(src).cut(2, 4)) == [102, 103, 104]
+
+
+def test_cut_rejects_invalid_range(src):
+    with pytest.raises(PipelineError):
+        PdfPipeline.open(src).cut(3, 2)
+
+
+@pytest.mark.parametrize("start, end", [(7, 9), (2, 9), (0, 2)])
+def test_cut_rejects_range_outside_document(tmp_path, cover, start, end):
+    short = make_pdf(tmp_path / "short.pdf", [101, 102, 103])
+    with pytest.raises(PipelineError):
+        PdfPipeline.open(short).cut(start, end).merge([cover])
+
+
+def test_delete_uses_current_numbering(src):
+    pipeline = PdfPipeline.open(src).cut(2, 5).delete([1, 3])
+    assert widths(pipeline) == [103, 105]
+
+
+def test_delete_rejects_out_of_range(src):
+    with pytest.raises(PipelineError):
+        PdfPipeline.open(src).delete([6])
+
+
+def test_insert_positions(src, cover):
+    assert widths(PdfPipeline.open(src).cut(1, 2).insert(cover, after=0)) == [201, 101, 102]
+    assert widths(PdfPipeline.open(src).cut(1, 2).insert(cover, after=1)) == [101, 201, 102]
+    assert widths(PdfPipeline.open(src).cut(1, 2).insert(cover)) == [101, 102, 201]
+    with pytest.raises(PipelineError):
+        PdfPipeline.open(src).cut(1, 2).insert(cover, after=3)
+
+
+def test_merge_appends_in_order(src, cover):
+    assert widths(PdfPipeline.open(cover).merge([src, cover])) == [201] + [101, 102, 103, 104, 105] + [201]
+
+
+def test_rotate_rejects_non_right_angle(src):
+    with pytest.raises(PipelineError):
+        PdfPipeline.open(src).rotate(45)
+
+
+# ---------------- 重复来源 ----------------
+def test_duplicated_source_pages_are_independent(src, cover, tmp_path):
+    out = str(tmp_path / "out.pdf")
+    PdfPipeline.open(cover).merge([cover]).insert(cover).rotate(90).save(out)
+    assert widths(out) == [201, 201, 201]
+    assert rotations(out) == [90, 90, 90]
+    # 每个位置都是独立页面对象，页树中没有重复引用
+    kids = PdfReader(out).trailer["/Root"]["/Pages"]["/Kids"]
+    assert len({kid.idnum for kid in kids}) == 3
+
+
+def test_rotate_empty_selection_rotates_nothing(src, tmp_path):
+    out = str(tmp_path / "out.pdf")
+    PdfPipeline.open(src).apply([{"op": "rotate", "angle": 90, "pages": []}]).save(out)
+    assert rotations(out) == [0, 0, 0, 0, 0]
+
+
+def test_rotate_repeated_page_number_rotates_once(src, tmp_path):
+    out = str(tmp_path / "out.pdf")
+    PdfPipeline.open(src).rotate(90, pages=[2, 2]).save(out)
+    assert rotations(out) == [0, 90, 0, 0, 0]
+
+
+# ---------------- 输出 ----------------
+def test_save_without_pages_fails(tmp_path):
+    with pytest.raises(PipelineError):
+        PdfPipeline().save(str(tmp_path / "out.pdf"))
+
+
+def test_save_with_compress(src, tmp_path):
+    pytest.importorskip("fitz")
+    out = str(tmp_path / "out.pdf")
+    PdfPipeline.open(src).cut(1, 3).compress("low").save(out)
+    assert widths(out) == [101, 102, 103]
+
+
+def test_compress_rejects_unknown_level(src):
+    with pytest.raises(PipelineError):
+        PdfPipeline.open(src).compress("best")
+
+
+# ---------------- 配置 ----------------
+def test_apply_dispatches_steps(src):
+    pipeline = PdfPipeline.open(src).apply([
+        {"op": "cut", "start": 1, "end": 3},
+        {"op": "delete", "pages": [2]},
+    ])
+    assert widths(pipeline) == [101, 103]
+
+
+@pytest.mark.parametrize("steps", [
+    [{"op": "explode"}],
+    [{"start": 1, "end": 2}],
+    [{"op": "cut", "start": 1}],
+    [{"op": "cut", "first": 1, "end": 2}],
+    ["cut"],
+    [["op", "cut"]],
+])
+def test_apply_rejects_bad_steps(src, steps):
+    with pytest.raises(PipelineError):
+        PdfPipeline.open(src).apply(steps)
+
+
+def write_config(path, config):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+    return str(path)
+
+
+def test_load_config_resolves_against_config_dir(tmp_path):
+    os.makedirs(tmp_path / "conf")
+    path = write_config(tmp_path / "conf" / "p.json", {
+        "input": "in.pdf",
+        "steps": [{"op": "insert", "file": "c.pdf"}, {"op": "merge", "files": ["a.pdf", "b.pdf"]}],
+    })
+    config = load_config(path)
+    base = str(tmp_path / "conf")
+    assert config["input"] == os.path.join(base, "in.pdf")
+    assert config["steps"][0]["file"] == os.path.join(base, "c.pdf")
+    assert config["steps"][1]["files"] == [os.path.join(base, "a.pdf"), os.path.join(base, "b.pdf")]
+
+
+@pytest.mark.parametrize("config", [
+    [],
+    {"output": "x.pdf"},
+    {"steps": {"op": "cut"}},
+    {"steps": ["cut"]},
+    {"steps": [{"op": "merge", "files": "a.pdf"}]},
+    {"steps": [{"op": "insert", "file": 3}]},
+])
+def test_load_config_rejects_bad_structure(tmp_path, config):
+    with pytest.raises(PipelineError):
+        load_config(write_config(tmp_path / "p.json", config))
+
+
+def test_output_path_for(tmp_path):
+    input_path = os.path.join("data", "scan.pdf")
+    assert output_path_for({}, input_path) == os.path.join("data", "scan_processed.pdf")
+    assert output_path_for({"output": "out/{name}.pdf"}, input_path) == os.path.join("data", "out/scan.pdf")
+    for pattern in ("{other}.pdf", "{0}.pdf", "{name.pdf"):
+        with pytest.raises(PipelineError):
+            output_path_for({"output": pattern}, input_path)
+
+
+def test_run_config_uses_default_input(src, tmp_path):
+    path = write_config(tmp_path / "p.json", {
+        "input": "src.pdf",
+        "output": "{name}_cut.pdf",
+        "steps": [{"op": "cut", "start": 4, "end": 5}],
+    })
+    out = run_config(load_config(path))
+    assert out == str(tmp_path / "src_cut.pdf")
+    assert widths(out) == [104, 105]
+
+
+# ---------------- 命令行 ----------------
+def test_main_reports_bad_config(tmp_path, capsys):
+    bad_json = tmp_path / "bad.json"
+    bad_json.write_text("{", encoding="utf-8")
+    for path in (str(tmp_path / "missing.json"), str(bad_json), write_config(tmp_path / "list.json", [])):
+        assert main([path]) == 2
+        assert "配置读取失败" in capsys.readouterr().out
+
+
+def test_main_reports_per_input_failures(src, tmp_path, capsys):
+    path = write_config(tmp_path / "p.json", {"steps": [{"op": "cut", "start": 1, "end": 2}]})
+    assert main([path, src, str(tmp_path / "missing.pdf")]) == 1
+    out = capsys.readouterr().out
+    assert "完成" in out and "失败" in out
+    assert widths(str(tmp_path / "src_processed.pdf")) == [101, 102]